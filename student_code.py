@@ -2,22 +2,135 @@
 TraversableDigraph and DAG module for Week 10.
 This module extends SortableDigraph with traversal methods and cycle detection.
 """
-from collections import deque
+from array import array
+from collections import deque, namedtuple
+from itertools import repeat
+
+# Compressed sparse row snapshot of a graph: node i has label labels[i],
+# successors indices[indptr[i]:indptr[i + 1]] and predecessors
+# rindices[rindptr[i]:rindptr[i + 1]]
+CSR = namedtuple(
+    "CSR", ["labels", "index", "indptr", "indices", "rindptr", "rindices"]
+)
+
+# Direction-optimizing BFS (Beamer et al.) switches to bottom-up steps once
+# the frontier's out-edges exceed 1/BFS_ALPHA of the unexplored edges, and
+# back once the frontier holds fewer than 1/BFS_BETA of the nodes
+BFS_ALPHA = 14
+BFS_BETA = 24
+BFS_HYBRID_MIN_NODES = 1024
+
+
+def _csr_dfs(indptr, indices, src):
+    """Return the node ids visited by a depth-first search from src."""
+    visited = bytearray(len(indptr) - 1)
+    visited[src] = 1
+    stack = list(reversed(indices[indptr[src]:indptr[src + 1]]))
+    order = []
+
+    while stack:
+        current = stack.pop()
+        if not visited[current]:
+            visited[current] = 1
+            order.append(current)
+            for pos in range(indptr[current + 1] - 1, indptr[current] - 1, -1):
+                nxt = indices[pos]
+                if not visited[nxt]:
+                    stack.append(nxt)
+
+    return order
+
+
+def _csr_out_edges(indptr, nodes):
+    """Return the number of edges leaving the given node ids."""
+    return sum(indptr[u + 1] - indptr[u] for u in nodes)
+
+
+def _csr_top_down_step(indptr, indices, frontier, visited):
+    """
+    Return the unvisited successors of frontier in discovery order,
+    marking them visited.
+    """
+    next_frontier = []
+    for current in frontier:
+        for pos in range(indptr[current], indptr[current + 1]):
+            nxt = indices[pos]
+            if not visited[nxt]:
+                visited[nxt] = 1
+                next_frontier.append(nxt)
+
+    return next_frontier
+
+
+def _csr_bottom_up_step(rindptr, rindices, frontier, visited):
+    """
+    Return the unvisited nodes with a predecessor in frontier, marking
+    them visited. Each node stops at the first such predecessor.
+    """
+    in_frontier = bytearray(len(visited))
+    for current in frontier:
+        in_frontier[current] = 1
+
+    next_frontier = []
+    for node, seen in enumerate(visited):
+        if seen:
+            continue
+        for pos in range(rindptr[node], rindptr[node + 1]):
+            if in_frontier[rindices[pos]]:
+                visited[node] = 1
+                next_frontier.append(node)
+                break
+
+    return next_frontier
 
 
 class VersatileDigraph:
     """A class to represent a directed graph with node and edge metadata."""
 
+    __slots__ = (
+        "nodes", "adjacency", "reverse_adjacency", "edge_weight", "edge_name",
+        "_in_degrees", "_csr"
+    )
+
     def __init__(self):
         self.nodes = {}
-        self.edges = {}
         self.adjacency = {}
+        self.reverse_adjacency = {}
+        # Edge attributes are kept in one dict per attribute, keyed by
+        # (start_node, end_node), rather than in a small dict per edge
+        self.edge_weight = {}
+        self.edge_name = {}
+        self._in_degrees = {}
+        self._csr = None
 
     def add_node(self, node_id, node_value=0):
         """Given a node_id and an optional node_value, add the node to the graph"""
+        self._csr = None
         self.nodes[node_id] = node_value
         if node_id not in self.adjacency:
             self.adjacency[node_id] = []
+        if node_id not in self.reverse_adjacency:
+            self.reverse_adjacency[node_id] = []
+        self._in_degrees.setdefault(node_id, 0)
+
+    def add_nodes(self, node_ids, node_value=0):
+        """
+        Add every node in node_ids with the same node_value in one call.
+        Equivalent to calling add_node for each id in order; ids already
+        in the graph just have their value updated.
+        Return the ids that were new to the graph, in order.
+        """
+        self._csr = None
+        batch = dict.fromkeys(node_ids, node_value)
+        new_nodes = [n for n in batch if n not in self.adjacency]
+
+        self.nodes.update(batch)
+        # iter(list, None) yields a fresh empty list per new node, so the
+        # updates run in C without building an intermediate dict
+        self.adjacency.update(zip(new_nodes, iter(list, None)))
+        self.reverse_adjacency.update(zip(new_nodes, iter(list, None)))
+        self._in_degrees.update(zip(new_nodes, repeat(0)))
+        return new_nodes
 
     def add_edge(
         self,
@@ -29,18 +142,45 @@ class VersatileDigraph:
         edge_weight=0
     ):
         """Add an edge to the graph with optional parameters"""
-        if start_node not in self.nodes:
+        if start_node not in self.adjacency:
             self.add_node(start_node, start_node_value)
-        if end_node not in self.nodes:
+        if end_node not in self.adjacency:
             self.add_node(end_node, end_node_value)
 
-        self.edges[(start_node, end_node)] = {
-            "weight": edge_weight, "name": edge_name
-        }
+        # Unnamed edges, the common case, get no entry in edge_name
+        key = (start_node, end_node)
+        self.edge_weight[key] = edge_weight
+        if edge_name:
+            self.edge_name[key] = edge_name
+        else:
+            self.edge_name.pop(key, None)
 
-        if start_node not in self.adjacency:
-            self.adjacency[start_node] = []
-        self.adjacency[start_node].append((end_node, edge_name))
+        self.adjacency[start_node].append(end_node)
+        self.reverse_adjacency[end_node].append(start_node)
+        self._in_degrees[end_node] += 1
+        self._csr = None
+
+    def freeze(self):
+        """
+        Build and return a CSR snapshot of the graph with nodes numbered
+        0..V-1 in insertion order. Traversals use the snapshot until the
+        graph is next modified.
+        """
+        labels = list(self.nodes)
+        index = {node: i for i, node in enumerate(labels)}
+        indptr = array("l", [0])
+        indices = array("l")
+        rindptr = array("l", [0])
+        rindices = array("l")
+
+        for node in labels:
+            indices.extend(index[dst] for dst in self.adjacency[node])
+            indptr.append(len(indices))
+            rindices.extend(index[src] for src in self.reverse_adjacency[node])
+            rindptr.append(len(rindices))
+
+        self._csr = CSR(labels, index, indptr, indices, rindptr, rindices)
+        return self._csr
 
     def get_nodes(self):
         """Return a list of nodes in the graph"""
@@ -48,49 +188,55 @@ class VersatileDigraph:
 
     def get_edge_weight(self, start_node, end_node):
         """Given the start_node and the end_node for an edge, return the edge weight"""
-        return self.edges.get((start_node, end_node), {}).get("weight", 0)
+        return self.edge_weight.get((start_node, end_node), 0)
 
     def get_node_value(self, node_id):
         """Given a node_id, return the node value"""
         return self.nodes.get(node_id, 0)
 
     def predecessors(self, target_node):
-        """Given a node, return a list of nodes that immediately precede that node"""
-        return [
-            src for (src, dst) in self.edges
-            if dst == target_node
-        ]
+        """
+        Given a node, return a list of nodes that immediately precede that node.
+        Like successors, a node appears once per edge added, so an edge added
+        twice lists its start node twice.
+        """
+        return list(self.reverse_adjacency.get(target_node, ()))
 
     def successors(self, src_node):
         """Given a node, return a list of nodes that immediately succeed that node"""
-        return [dst for dst, _ in self.adjacency.get(src_node, [])]
+        return list(self.adjacency.get(src_node, ()))
 
     def indegree(self, target_node):
-        """Given a node, return the number of edges that lead to that node"""
-        return sum(
-            1 for (src, dst) in self.edges
-            if dst == target_node
-        )
+        """
+        Given a node, return the number of edges that lead to that node,
+        counting an edge once per time it was added (as outdegree does).
+        """
+        return self._in_degrees.get(target_node, 0)
 
     def outdegree(self, src_node):
         """Given a node, return the number of edges that lead from that node"""
-        return len(self.adjacency.get(src_node, []))
+        return len(self.adjacency.get(src_node, ()))
 
 
 class SortableDigraph(VersatileDigraph):
     """A directed graph class with topological sorting capability."""
 
+    __slots__ = ()
+
     def top_sort(self):
         """
         Return a topologically sorted list of nodes in the graph.
         Uses Kahn's algorithm (BFS-based approach).
         """
-        in_degrees = {n: self.indegree(n) for n in self.nodes}
-        queue = [n for n in self.nodes if in_degrees[n] == 0]
+        if self._csr is not None:
+            return self._top_sort_csr()
+
+        in_degrees = dict(self._in_degrees)
+        queue = deque(n for n, degree in in_degrees.items() if degree == 0)
         result = []
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             result.append(current)
 
             for nxt in self.successors(current):
@@ -103,55 +249,220 @@ class SortableDigraph(VersatileDigraph):
 
         return result
 
+    def _top_sort_csr(self):
+        """
+        Kahn's algorithm over the frozen CSR arrays, one level at a time.
+        Produces the same order as the queue-based version.
+        """
+        labels, _, indptr, indices = self._csr[:4]
+        in_degrees = [0] * len(labels)
+        for nxt in indices:
+            in_degrees[nxt] += 1
+
+        frontier = [i for i, degree in enumerate(in_degrees) if degree == 0]
+        result = []
+
+        while frontier:
+            result.extend(frontier)
+            next_frontier = []
+            for current in frontier:
+                for nxt in indices[indptr[current]:indptr[current + 1]]:
+                    in_degrees[nxt] -= 1
+                    if in_degrees[nxt] == 0:
+                        next_frontier.append(nxt)
+            frontier = next_frontier
+
+        if len(result) != len(labels):
+            raise ValueError("Graph contains a cycle")
+
+        return [labels[i] for i in result]
+
 
 class TraversableDigraph(SortableDigraph):
     """Extends SortableDigraph with depth-first and breadth-first traversal methods."""
 
+    __slots__ = ()
+
     def dfs(self, start_node):
         """
         Perform depth-first search traversal starting from start_node.
         Yields each node as it is visited (NOT including the start node).
-        Uses a stack (implemented with a list).
+        The traversal is built up front by dfs_list and then streamed.
         """
-        if start_node not in self.nodes:
-            return
+        yield from self.dfs_list(start_node)
 
-        visited = set([start_node])
-        stack = list(self.successors(start_node))[::-1]
+    def bfs(self, start_node, direction_optimizing=False):
+        """
+        Perform breadth-first search traversal starting from start_node.
+        Yields each node as it is visited (NOT including the start node).
+        The traversal is built up front by bfs_list and then streamed;
+        see bfs_list for direction_optimizing.
+        """
+        yield from self.bfs_list(start_node, direction_optimizing)
+
+    def dfs_list(self, start_node):
+        """
+        Return the depth-first traversal from start_node as a list
+        (NOT including the start node). Uses a stack (implemented with a
+        list) in one tight loop, with bound methods hoisted into locals.
+        """
+        if start_node not in self.adjacency:
+            return []
+        if self._csr is not None:
+            return self._dfs_csr(start_node)
+
+        # Walk the adjacency lists backwards so the first successor is
+        # popped first
+        adjacency = self.adjacency
+        visited = {start_node}
+        visited_add = visited.add
+        stack = adjacency[start_node][::-1]
+        stack_append = stack.append
+        stack_pop = stack.pop
+        result = []
+        result_append = result.append
 
         while stack:
-            current = stack.pop()
+            current = stack_pop()
             if current not in visited:
-                visited.add(current)
-                yield current
-                successors = self.successors(current)
-                for nxt in reversed(successors):
+                visited_add(current)
+                result_append(current)
+                for nxt in reversed(adjacency[current]):
                     if nxt not in visited:
-                        stack.append(nxt)
+                        stack_append(nxt)
 
-    def bfs(self, start_node):
+        return result
+
+    def bfs_list(self, start_node, direction_optimizing=False):
         """
-        Perform breadth-first search traversal starting from start_node.
-        Yields each node as it is visited (NOT including the start node).
-        Uses a deque for efficient FIFO operations.
+        Return the breadth-first traversal from start_node as a list
+        (NOT including the start node). Uses a deque in one tight loop,
+        with bound methods hoisted into locals.
+
+        direction_optimizing only applies to a frozen graph with at least
+        BFS_HYBRID_MIN_NODES nodes. It lets levels with a heavy frontier be
+        expanded bottom-up from the unvisited nodes. Every level still comes
+        before the next, but nodes within a bottom-up level are listed in
+        insertion order rather than discovery order.
         """
-        if start_node not in self.nodes:
-            return
+        if start_node not in self.adjacency:
+            return []
+        if self._csr is not None:
+            return self._bfs_csr(start_node, direction_optimizing)
 
-        visited = set([start_node])
+        adjacency = self.adjacency
+        visited = {start_node}
+        visited_add = visited.add
         queue = deque([start_node])
+        queue_append = queue.append
+        queue_popleft = queue.popleft
+        result = []
+        result_append = result.append
 
         while queue:
-            current = queue.popleft()
-            for nxt in self.successors(current):
+            for nxt in adjacency[queue_popleft()]:
                 if nxt not in visited:
-                    visited.add(nxt)
-                    queue.append(nxt)
-                    yield nxt
+                    visited_add(nxt)
+                    queue_append(nxt)
+                    result_append(nxt)
+
+        return result
+
+    def _dfs_csr(self, start_node):
+        """Depth-first search over the frozen CSR arrays, as a label list."""
+        csr = self._csr
+        labels = csr.labels
+        return [
+            labels[i]
+            for i in _csr_dfs(csr.indptr, csr.indices, csr.index[start_node])
+        ]
+
+    def _bfs_csr(self, start_node, direction_optimizing=False):
+        """
+        Breadth-first search over the frozen CSR arrays, one level at a time,
+        as a label list. With direction_optimizing on a large graph, levels
+        with a heavy frontier are expanded bottom-up and list their nodes in
+        id order instead of discovery order.
+        """
+        csr = self._csr
+        src = csr.index[start_node]
+        visited = bytearray(len(csr.labels))
+        visited[src] = 1
+        frontier = [src]
+        order = []
+
+        hybrid = (
+            direction_optimizing and len(csr.labels) >= BFS_HYBRID_MIN_NODES
+        )
+        bottom_up = False
+        unexplored_edges = len(csr.indices) - _csr_out_edges(csr.indptr, frontier)
+
+        while frontier:
+            if hybrid:
+                bottom_up = self._prefer_bottom_up(
+                    frontier, bottom_up, unexplored_edges
+                )
+            if bottom_up:
+                frontier = _csr_bottom_up_step(
+                    csr.rindptr, csr.rindices, frontier, visited
+                )
+            else:
+                frontier = _csr_top_down_step(
+                    csr.indptr, csr.indices, frontier, visited
+                )
+
+            order.extend(csr.labels[nxt] for nxt in frontier)
+            if hybrid:
+                unexplored_edges -= _csr_out_edges(csr.indptr, frontier)
+
+        return order
+
+    def _prefer_bottom_up(self, frontier, bottom_up, unexplored_edges):
+        """
+        Decide whether the next BFS level should be expanded bottom-up,
+        given the current direction and the edges out of unvisited nodes.
+        """
+        if bottom_up:
+            return len(frontier) * BFS_BETA >= len(self._csr.labels)
+        frontier_edges = _csr_out_edges(self._csr.indptr, frontier)
+        return frontier_edges * BFS_ALPHA > unexplored_edges
 
 
 class DAG(TraversableDigraph):
-    """Directed Acyclic Graph - ensures no cycles can be created."""
+    """
+    Directed Acyclic Graph - ensures no cycles can be created.
+    Keeps an online topological order (Pearce-Kelly) so cycle checks and
+    reordering only touch the nodes between the two ends of a new edge.
+    """
+
+    __slots__ = ("_rejected", "_ord", "_topo")
+
+    def __init__(self):
+        super().__init__()
+        # Edges refused for closing a cycle. Adding edges never removes a
+        # path, so a rejected edge stays rejected and retries are O(1)
+        self._rejected = set()
+        # _ord maps node -> rank and _topo maps rank -> node
+        self._ord = {}
+        self._topo = []
+
+    def add_node(self, node_id, node_value=0):
+        """Add a node, placing new nodes last in the topological order"""
+        super().add_node(node_id, node_value)
+        if node_id not in self._ord:
+            self._ord[node_id] = len(self._topo)
+            self._topo.append(node_id)
+
+    def add_nodes(self, node_ids, node_value=0):
+        """
+        Add a batch of nodes, then rank the new ones in a single pass,
+        placing them last in the topological order in the given order.
+        """
+        new_nodes = super().add_nodes(node_ids, node_value)
+        first = len(self._topo)
+        self._ord.update(zip(new_nodes, range(first, first + len(new_nodes))))
+        self._topo.extend(new_nodes)
+        return new_nodes
 
     def add_edge(
         self,
@@ -163,12 +474,15 @@ class DAG(TraversableDigraph):
         edge_weight=0
     ):
         """Add an edge only if it doesn't create a cycle."""
-        if start_node not in self.nodes:
+        if start_node not in self.adjacency:
             self.add_node(start_node, start_node_value)
-        if end_node not in self.nodes:
+        if end_node not in self.adjacency:
             self.add_node(end_node, end_node_value)
 
-        if self._has_path_dfs(end_node, start_node):
+        if (start_node, end_node) in self._rejected or self._has_path(
+            end_node, start_node
+        ):
+            self._rejected.add((start_node, end_node))
             raise ValueError(
                 f"Adding edge from {start_node} to {end_node} would create a cycle"
             )
@@ -178,30 +492,132 @@ class DAG(TraversableDigraph):
             start_node_value, end_node_value,
             edge_name, edge_weight
         )
+        if self._ord[end_node] < self._ord[start_node]:
+            self._reorder(start_node, end_node)
 
-    def _has_path_dfs(self, start, target):
-        """Return True if a path exists from start to target."""
-        if start not in self.nodes or target not in self.nodes:
+    def top_sort(self):
+        """
+        Return a topologically sorted list of nodes in the graph.
+        The order is maintained as edges are added, so this is a copy.
+        """
+        return list(self._topo)
+
+    def _has_path(self, start, target):
+        """
+        Return True if a path exists from start to target.
+        Runs a bidirectional BFS limited to the nodes ranked between them.
+        """
+        if start not in self.adjacency or target not in self.adjacency:
             return False
 
         if start == target:
             return True
 
-        visited = set()
-        stack = [start]
+        # A sink reaches nothing and a source is reached by nothing
+        if not self.adjacency[start] or not self.reverse_adjacency[target]:
+            return False
+
+        # Every node on a path from start to target sits between them in
+        # the topological order, so both searches stay inside that range
+        rank = self._ord
+        lower = rank[start]
+        upper = rank[target]
+        if lower > upper:
+            return False
+
+        # Bidirectional BFS: grow the smaller frontier one level at a time
+        # (forward from start, backward from target) until the two meet.
+        # Seen sets are bitmaps over the window of ranks lower..upper,
+        # indexed by rank - lower, so their size is the window's, not V's
+        forward_seen = bytearray(upper - lower + 1)
+        backward_seen = bytearray(upper - lower + 1)
+        forward_seen[0] = 1
+        backward_seen[-1] = 1
+        forward = [start]
+        backward = [target]
+        found = False
+
+        while forward and backward and not found:
+            if len(forward) <= len(backward):
+                forward, found = self._expand(
+                    forward, self.adjacency, forward_seen, backward_seen, lower
+                )
+            else:
+                backward, found = self._expand(
+                    backward, self.reverse_adjacency, backward_seen,
+                    forward_seen, lower
+                )
+
+        return found
+
+    def _expand(self, frontier, neighbors, seen, other_seen, lower):
+        """
+        Advance one side of a bidirectional search by a level through the
+        neighbors lists. The seen bitmaps cover the ranks from lower up,
+        indexed by rank - lower; nodes outside them are ignored. Return the
+        new frontier and whether it touched a node seen by the other side.
+        """
+        rank = self._ord
+        window = len(seen)
+        next_frontier = []
+
+        for current in frontier:
+            for nxt in neighbors[current]:
+                offset = rank[nxt] - lower
+                if not 0 <= offset < window:
+                    continue
+                if other_seen[offset]:
+                    return next_frontier, True
+                if not seen[offset]:
+                    seen[offset] = 1
+                    next_frontier.append(nxt)
+
+        return next_frontier, False
+
+    def _reorder(self, start_node, end_node):
+        """
+        Restore the topological order after adding start_node -> end_node
+        when end_node was ranked before start_node.
+        Only nodes ranked between the two ends are visited and moved.
+        """
+        lower = self._ord[end_node]
+        upper = self._ord[start_node]
+
+        forward = self._collect(end_node, self.adjacency, lower, upper)
+        backward = self._collect(start_node, self.reverse_adjacency, lower, upper)
+        if len(forward) == 1 and len(backward) == 1:
+            # Nothing else is in the way: the two ends swap ranks
+            self._ord[start_node], self._ord[end_node] = lower, upper
+            self._topo[lower], self._topo[upper] = start_node, end_node
+            return
+        forward.sort()
+        backward.sort()
+
+        # Nodes that lead to start_node must come before nodes reachable
+        # from end_node; reuse the ranks that the affected nodes held
+        moved = [self._topo[r] for r in backward + forward]
+        for node, rank in zip(moved, sorted(backward + forward)):
+            self._ord[node] = rank
+            self._topo[rank] = node
+
+    def _collect(self, source, neighbors, lower, upper):
+        """
+        Return the ranks of source and of the nodes reachable from it
+        through the neighbors lists whose rank is strictly between lower
+        and upper.
+        """
+        rank = self._ord
+        visited = {source}
+        stack = [source]
 
         while stack:
             current = stack.pop()
-            if current == target:
-                return True
-
-            if current not in visited:
-                visited.add(current)
-                for nxt in self.successors(current):
-                    if nxt not in visited:
-                        stack.append(nxt)
+            for nxt in neighbors[current]:
+                if nxt not in visited and lower < rank[nxt] < upper:
+                    visited.add(nxt)
+                    stack.append(nxt)
 
-        return False
+        return [rank[node] for node in visited]
 
 
 if __name__ == "__main__":
@@ -214,11 +630,11 @@ if __name__ == "__main__":
     tg.add_edge("D", "E")
 
     print("\nDFS from A:")
-    for n in tg.dfs("A"):
+    for n in tg.dfs_list("A"):
         print(f"  {n}")
 
     print("\nBFS from A:")
-    for n in tg.bfs("A"):
+    for n in tg.bfs_list("A"):
         print(f"  {n}")
 
     print("\n=== Testing DAG (Clothing Example) ===")
@@ -236,11 +652,11 @@ if __name__ == "__main__":
     clothing.add_edge("shoes", "jacket")
 
     print("\nDFS traversal from 'shirt':")
-    for item in clothing.dfs("shirt"):
+    for item in clothing.dfs_list("shirt"):
         print(f"  {item}")
 
     print("\nBFS traversal from 'shirt':")
-    for item in clothing.bfs("shirt"):
+    for item in clothing.bfs_list("shirt"):
         print(f"  {item}")
 
     print("\n=== Testing Cycle Detection ===")
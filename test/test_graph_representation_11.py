@@ -0,0 +1,27 @@
+import subprocess
+import re
+import pytest
+
+from student_code import DAG
+
+def test_add_edge_against_insertion_order():
+    graph = DAG()
+    # Nodes are added in the reverse of their final topological order
+    graph.add_node("D")
+    graph.add_node("C")
+    graph.add_node("B")
+    graph.add_node("A")
+    graph.add_edge("C", "D")
+    graph.add_edge("B", "C")
+    graph.add_edge("A", "B")
+
+    assert graph.top_sort() == ["A", "B", "C", "D"]
+
+    # Edges that would close a cycle are still rejected
+    with pytest.raises(ValueError):
+        graph.add_edge("D", "A")
+    with pytest.raises(ValueError):
+        graph.add_edge("C", "B")
+
+    graph.add_edge("A", "D")
+    assert graph.top_sort() == ["A", "B", "C", "D"]
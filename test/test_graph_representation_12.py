@@ -0,0 +1,32 @@
+import subprocess
+import re
+import pytest
+
+from student_code import TraversableDigraph
+
+def test_frozen_traversals():
+    graph = TraversableDigraph()
+    graph.add_edge("A", "B")
+    graph.add_edge("A", "C")
+    graph.add_edge("B", "D")
+    graph.add_edge("C", "D")
+    graph.add_edge("D", "E")
+    graph.add_edge("B", "F")
+
+    dfs_result = list(graph.dfs("A"))
+    bfs_result = list(graph.bfs("A"))
+    top_sort_result = graph.top_sort()
+
+    csr = graph.freeze()
+    assert csr.labels == ["A", "B", "C", "D", "E", "F"]
+    assert list(csr.indptr) == [0, 2, 4, 5, 6, 6, 6]
+    assert list(csr.indices) == [1, 2, 3, 5, 3, 4]
+
+    # Traversals over the CSR snapshot visit nodes in the same order
+    assert list(graph.dfs("A")) == dfs_result
+    assert list(graph.bfs("A")) == bfs_result
+    assert graph.top_sort() == top_sort_result
+
+    # Modifying the graph discards the snapshot
+    graph.add_edge("E", "G")
+    assert list(graph.bfs("D")) == ["E", "G"]
@@ -0,0 +1,24 @@
+import subprocess
+import re
+import pytest
+
+from student_code import TraversableDigraph
+
+def test_traversal_lists():
+    graph = TraversableDigraph()
+    graph.add_edge("A", "B")
+    graph.add_edge("A", "C")
+    graph.add_edge("B", "D")
+    graph.add_edge("C", "D")
+    graph.add_edge("D", "E")
+    graph.add_edge("B", "F")
+
+    # The list variants match the generators, frozen or not
+    assert graph.dfs_list("A") == list(graph.dfs("A"))
+    assert graph.bfs_list("A") == list(graph.bfs("A"))
+    graph.freeze()
+    assert graph.dfs_list("A") == list(graph.dfs("A"))
+    assert graph.bfs_list("A") == list(graph.bfs("A"))
+
+    assert graph.bfs_list("E") == []
+    assert graph.dfs_list("Z") == []
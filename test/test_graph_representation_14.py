@@ -0,0 +1,46 @@
+import subprocess
+import re
+import pytest
+
+from student_code import DAG
+
+def test_add_nodes():
+    graph = DAG()
+    graph.add_node("A", 1)
+    graph.add_nodes(["B", "C", "A", "D"], 5)
+
+    assert graph.get_nodes() == ["A", "B", "C", "D"]
+    assert graph.get_node_value("A") == 5
+    assert graph.get_node_value("D") == 5
+    assert graph.indegree("C") == 0
+
+    graph.add_edge("D", "A")
+    graph.add_edge("C", "B")
+    assert graph.predecessors("A") == ["D"]
+
+    # Check that the result is a valid topological sort
+    valid_orders = [
+        ["C", "B", "D", "A"],
+        ["C", "D", "A", "B"],
+        ["C", "D", "B", "A"],
+        ["D", "A", "C", "B"],
+        ["D", "C", "A", "B"],
+        ["D", "C", "B", "A"],
+    ]
+    assert graph.top_sort() in valid_orders
+    with pytest.raises(ValueError):
+        graph.add_edge("A", "D")
+
+
+def test_add_nodes_from_generator():
+    graph = DAG()
+    graph.add_edge("x", "y")
+    new_nodes = graph.add_nodes(f"n{i}" for i in range(3))
+
+    # The generator is consumed once; every id is added and ranked
+    assert new_nodes == ["n0", "n1", "n2"]
+    assert graph.get_nodes() == ["x", "y", "n0", "n1", "n2"]
+    assert graph.top_sort() == ["x", "y", "n0", "n1", "n2"]
+
+    graph.add_edge("n2", "x")
+    assert graph.top_sort().index("n2") < graph.top_sort().index("x")
@@ -0,0 +1,44 @@
+import subprocess
+import re
+import pytest
+
+import student_code
+from student_code import TraversableDigraph
+
+def test_direction_optimizing_bfs(monkeypatch):
+    # Large enough for the hybrid BFS, with a wide first level so the
+    # second level is expanded bottom-up
+    size = 1200
+    graph = TraversableDigraph()
+    graph.add_nodes(range(size))
+    for i in range(1, 200):
+        graph.add_edge(0, i)
+    for i in range(1, size):
+        graph.add_edge(i, (i * 37) % size)
+        graph.add_edge(i, (i * 101 + 7) % size)
+
+    top_down = graph.bfs_list(0)
+
+    # Levels of each node, from the plain top-down traversal
+    level = {0: 0}
+    for node in top_down:
+        level[node] = min(level[p] for p in graph.predecessors(node) if p in level) + 1
+
+    bottom_up_steps = []
+    original_step = student_code._csr_bottom_up_step
+    def counting_step(*args):
+        bottom_up_steps.append(len(args[2]))
+        return original_step(*args)
+    monkeypatch.setattr(student_code, "_csr_bottom_up_step", counting_step)
+
+    graph.freeze()
+
+    # By default the frozen graph keeps the exact top-down order
+    assert graph.bfs_list(0) == top_down
+    assert not bottom_up_steps
+
+    hybrid = graph.bfs_list(0, direction_optimizing=True)
+    assert bottom_up_steps
+    assert sorted(hybrid) == sorted(top_down)
+    assert [level[n] for n in hybrid] == sorted(level[n] for n in hybrid)
+    assert list(graph.bfs(0, direction_optimizing=True)) == hybrid
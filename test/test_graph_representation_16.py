@@ -0,0 +1,26 @@
+import subprocess
+import re
+import pytest
+
+from student_code import TraversableDigraph
+
+def test_duplicate_edges():
+    graph = TraversableDigraph()
+    graph.add_edge("A", "B", edge_weight=1)
+    graph.add_edge("A", "B", edge_weight=2)
+    graph.add_edge("B", "C")
+
+    # Every insertion counts, on both ends of the edge
+    assert graph.successors("A") == ["B", "B"]
+    assert graph.predecessors("B") == ["A", "A"]
+    assert graph.indegree("B") == 2
+    assert graph.outdegree("A") == 2
+    # The weight is per (start, end) pair; the latest one wins
+    assert graph.get_edge_weight("A", "B") == 2
+
+    assert graph.top_sort() == ["A", "B", "C"]
+
+    # A cycle through a node with duplicate in-edges is still detected
+    graph.add_edge("C", "B")
+    with pytest.raises(ValueError):
+        graph.top_sort()